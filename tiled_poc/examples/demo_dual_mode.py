@@ -185,7 +185,7 @@ def demo_same_data_two_modes(client):
     if path_rel:
         path = os.path.join(base_dir, path_rel)
         print(f"  Path from metadata: ...{path_rel[-40:]}")
-        with h5py.File(path, "r") as f:
+        with h5py.File(path, "r", locking=False) as f:
             data_a = f["/curve/M_parallel"][:]
         print(f"  Loaded via h5py: shape={data_a.shape}")
 
@@ -223,7 +223,7 @@ def _(INCIDENT_ENERGY_MEV, MAX_SPECTRA_DEMO, mo, np, subset, time):
                 continue
 
             path = os.path.join(base_dir, path_rel)
-            with h5py.File(path, "r") as f:
+            with h5py.File(path, "r", locking=False) as f:
                 spectrum = f[dataset_path][:]
 
             spectra_list.append(spectrum)
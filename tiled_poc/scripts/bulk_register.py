@@ -9,6 +9,7 @@
 #     "numpy",
 #     "ruamel.yaml",
 #     "canonicaljson",
+#     "orjson",
 #     "sqlalchemy",
 # ]
 # ///
@@ -20,8 +21,12 @@ Uses direct SQLAlchemy with trigger disable/rebuild pattern.
 
 Key optimizations:
 - Single database transaction for all inserts
+- SQLite bulk-load PRAGMAs (no fsync, in-memory journal), restored afterwards
+- Batched executemany inserts on the raw sqlite3 cursor (no per-row round trips)
+- orjson serialization of metadata
 - Disables closure table trigger during bulk load
-- Rebuilds closure table with set-based SQL
+- Drops secondary indexes during bulk load, rebuilds them once at the end
+- Rebuilds closure table with a single recursive CTE
 - Re-enables trigger for future incremental updates
 
 When to use:
@@ -53,14 +58,14 @@ Usage:
 import os
 import sys
 import time
-import json
 import hashlib
 import argparse
+from contextlib import contextmanager
 from pathlib import Path
 
 import numpy as np
-import pandas as pd
 import canonicaljson
+import orjson
 from sqlalchemy import create_engine, text
 
 # Import from shared helpers
@@ -72,15 +77,60 @@ from config import (
     get_default_shapes,
     get_catalog_db_path,
 )
-from utils import make_artifact_key
+from utils import ART_COLUMNS, HAM_COLUMNS, make_artifact_keys, read_manifest
 
 
 def compute_structure_id(structure):
-    """Compute HEX digest of MD5 hash of RFC 8785 canonical JSON."""
+    """Compute HEX digest of MD5 hash of RFC 8785 canonical JSON.
+
+    This must stay identical to Tiled's own structure id so that structures
+    created later through the HTTP API (register_catalog.py) deduplicate
+    against rows written here. Cost is negligible: get_array_structure()
+    calls it once per unique shape.
+    """
     canonical = canonicaljson.encode_canonical_json(structure)
     return hashlib.md5(canonical).hexdigest()
 
 
+# All VDP artifacts are little-endian float64 arrays
+FLOAT64_DATA_TYPE = {"endianness": "little", "kind": "f", "itemsize": 8}
+
+# shape tuple -> (structure_id, structure)
+_structure_cache = {}
+
+
+def get_array_structure(data_shape):
+    """Get (structure_id, structure) for a float64 array of the given shape.
+
+    Memoized by shape: artifacts share a handful of shapes, so canonical
+    JSON + MD5 only run once per unique shape.
+    """
+    sig = tuple(data_shape)
+    cached = _structure_cache.get(sig)
+    if cached is None:
+        # Chunks must be list of lists, one per dimension
+        structure = {
+            "data_type": FLOAT64_DATA_TYPE,
+            "chunks": [[dim] for dim in sig],
+            "shape": list(sig),
+            "dims": None,
+            "resizable": False,
+        }
+        cached = (compute_structure_id(structure), structure)
+        _structure_cache[sig] = cached
+    return cached
+
+
+def dumps(obj):
+    """Serialize to JSON text with orjson (decoded: the columns are TEXT)."""
+    return orjson.dumps(obj).decode()
+
+
+# Pre-serialized empty specs / access_blob (the same for every node)
+EMPTY_LIST_JSON = "[]"
+EMPTY_DICT_JSON = "{}"
+
+
 # SQLite trigger SQL (from Tiled orm.py)
 CLOSURE_TRIGGER_SQL = """
 CREATE TRIGGER update_closure_table_when_inserting
@@ -95,6 +145,137 @@ BEGIN
 END
 """
 
+# Statements for the bulk load, bound with sqlite3 "?" placeholders and
+# prepared once per executemany / execute call.
+NODE_INSERT_SQL = """
+INSERT INTO nodes (parent, key, structure_family, metadata, specs, access_blob)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+STRUCT_INSERT_SQL = "INSERT OR IGNORE INTO structures (id, structure) VALUES (?, ?)"
+
+# Staging table: one row per artifact node (each has exactly one data source)
+TMP_ART_CREATE_SQL = """
+CREATE TEMP TABLE tmp_art (
+    node_id INTEGER PRIMARY KEY,
+    structure_id TEXT NOT NULL,
+    data_uri TEXT NOT NULL,
+    parameters TEXT NOT NULL
+)
+"""
+
+TMP_ART_INSERT_SQL = (
+    "INSERT INTO tmp_art (node_id, structure_id, data_uri, parameters) VALUES (?, ?, ?, ?)"
+)
+
+# Assets deduplicated by data_uri, in first-seen order
+ASSET_INSERT_SQL = """
+INSERT OR IGNORE INTO assets (data_uri, is_directory)
+SELECT data_uri, 0 FROM tmp_art
+GROUP BY data_uri
+ORDER BY MIN(node_id)
+"""
+
+DS_INSERT_SQL = """
+INSERT INTO data_sources (node_id, structure_id, mimetype, parameters, management, structure_family)
+SELECT node_id, structure_id, 'application/x-hdf5', parameters, 'external', 'array'
+FROM tmp_art
+ORDER BY node_id
+"""
+
+ASSOC_INSERT_SQL = """
+INSERT INTO data_source_asset_association (data_source_id, asset_id, parameter, num)
+SELECT ds.id, a.id, 'data_uris', NULL
+FROM tmp_art t
+JOIN data_sources ds ON ds.node_id = t.node_id
+JOIN assets a ON a.data_uri = t.data_uri
+ORDER BY ds.id
+"""
+
+# All (ancestor, descendant, depth) pairs in one recursive query:
+# self-references at depth 0, then walk down one level per step.
+# Correct for any hierarchy depth (uses the ix_nodes_parent index).
+CLOSURE_REBUILD_SQL = """
+INSERT INTO nodes_closure (ancestor, descendant, depth)
+WITH RECURSIVE closure(ancestor, descendant, depth) AS (
+    SELECT id, id, 0 FROM nodes
+    UNION ALL
+    SELECT c.ancestor, n.id, c.depth + 1
+    FROM closure c
+    JOIN nodes n ON n.parent = c.descendant
+)
+SELECT ancestor, descendant, depth FROM closure
+"""
+
+# SQLite PRAGMAs for the bulk load: no fsync, in-memory rollback journal,
+# large page cache, and an exclusive lock held for the whole transaction.
+BULK_LOAD_PRAGMAS = {
+    "synchronous": "OFF",
+    "journal_mode": "MEMORY",
+    "temp_store": "MEMORY",
+    "cache_size": "-262144",  # 256 MB (negative = KiB)
+    "locking_mode": "EXCLUSIVE",
+}
+
+
+# Tables whose non-unique indexes are dropped for the bulk load and rebuilt
+# afterwards: one sorted index build instead of a B-tree update per row.
+BULK_INDEXED_TABLES = ("nodes", "data_sources", "data_source_asset_association", "nodes_closure")
+
+
+def drop_secondary_indexes(conn, tables=BULK_INDEXED_TABLES):
+    """Drop the non-unique indexes on tables.
+
+    Unique indexes are kept, since INSERT OR IGNORE relies on them.
+
+    Returns:
+        dict: table -> list of CREATE INDEX statements to rebuild them.
+    """
+    saved = {}
+    for table in tables:
+        rows = conn.execute(
+            text("""
+                SELECT name, sql FROM sqlite_master
+                WHERE type = 'index' AND tbl_name = :table
+                  AND sql IS NOT NULL AND sql NOT LIKE 'CREATE UNIQUE%'
+            """),
+            {"table": table},
+        ).fetchall()
+        for name, sql in rows:
+            conn.execute(text(f'DROP INDEX "{name}"'))
+        saved[table] = [sql for _, sql in rows]
+    return saved
+
+
+def create_indexes(conn, index_sql):
+    """Re-run saved CREATE INDEX statements."""
+    for sql in index_sql:
+        conn.execute(text(sql))
+
+
+@contextmanager
+def bulk_load_pragmas(conn):
+    """Apply BULK_LOAD_PRAGMAS for the duration of the block.
+
+    The previous values are read first and always restored on exit, so the
+    database keeps its normal durability settings for incremental updates.
+    """
+    saved = {
+        name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+        for name in BULK_LOAD_PRAGMAS
+    }
+    for name, value in BULK_LOAD_PRAGMAS.items():
+        conn.exec_driver_sql(f"PRAGMA {name}={value}")
+    conn.commit()  # end the autobegun transaction so the caller can begin()
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            conn.exec_driver_sql(f"PRAGMA {name}={value}")
+        # locking_mode=NORMAL only releases the lock on the next access
+        conn.exec_driver_sql("SELECT 1 FROM nodes LIMIT 1").fetchall()
+        conn.commit()
+
 
 def init_database(db_path):
     """Initialize database with Tiled schema.
@@ -126,8 +307,11 @@ def init_database(db_path):
     return engine
 
 
-def load_manifests():
-    """Load Hamiltonian and Artifact manifests."""
+def load_manifests(max_hamiltonians=None):
+    """Load Hamiltonian and Artifact manifests (only the columns we use).
+
+    If max_hamiltonians is given, only that many Hamiltonian rows are read.
+    """
     base_dir = get_base_dir()
     print(f"Loading manifests from {base_dir}...")
 
@@ -137,8 +321,8 @@ def load_manifests():
     print(f"  Hamiltonians: {Path(ham_path).name}")
     print(f"  Artifacts:    {Path(art_path).name}")
 
-    ham_df = pd.read_parquet(ham_path)
-    art_df = pd.read_parquet(art_path)
+    ham_df = read_manifest(ham_path, HAM_COLUMNS, max_rows=max_hamiltonians)
+    art_df = read_manifest(art_path, ART_COLUMNS)
 
     print(f"  Rows: {len(ham_df)} Hamiltonians, {len(art_df)} artifacts")
 
@@ -148,6 +332,10 @@ def load_manifests():
 def prepare_node_data(ham_df, art_df, max_hamiltonians):
     """Prepare all node data for bulk insert.
 
+    Works on whole-column arrays rather than iterrows(): artifacts are
+    stably sorted by huid once, and each Hamiltonian's artifacts are then a
+    contiguous [start, end) slice located with np.searchsorted.
+
     Returns:
         ham_nodes: List of Hamiltonian node dicts
         art_nodes: List of artifact node dicts (with placeholder parent)
@@ -158,36 +346,71 @@ def prepare_node_data(ham_df, art_df, max_hamiltonians):
     default_shapes = get_default_shapes()
 
     ham_subset = ham_df.head(max_hamiltonians)
-    art_grouped = art_df.groupby("huid")
+
+    def column(df, name, default=None):
+        """Column as a Python list, or [default] * n if the column is absent."""
+        if name in df.columns:
+            return df[name].tolist()
+        return [default] * len(df)
+
+    # Hamiltonian columns (tolist() converts to Python scalars once per column)
+    ham_huid_arr = ham_subset["huid"].to_numpy(dtype=str)
+    ham_huids = ham_huid_arr.tolist()
+    ham_Ja = ham_subset["Ja_meV"].astype(float).tolist()
+    ham_Jb = ham_subset["Jb_meV"].astype(float).tolist()
+    ham_Jc = ham_subset["Jc_meV"].astype(float).tolist()
+    ham_Dc = ham_subset["Dc_meV"].astype(float).tolist()
+    ham_spin = [float(v) for v in column(ham_subset, "spin_s", 2.5)]
+    ham_g = [float(v) for v in column(ham_subset, "g_factor", 2.0)]
+
+    # Only the selected Hamiltonians' artifacts, so rows elsewhere in the
+    # manifest cannot affect (or break) a partial run
+    art_huid_all = art_df["huid"].to_numpy(dtype=str)
+    selected = np.isin(art_huid_all, ham_huid_arr)
+    art_df = art_df[selected]
+    art_huid_all = art_huid_all[selected]
+
+    # Artifacts sorted by huid; stable so manifest order is kept per Hamiltonian
+    order = np.argsort(art_huid_all, kind="stable")
+    art_sorted = art_df.iloc[order]
+    starts = np.searchsorted(art_huid_all[order], ham_huid_arr, side="left").tolist()
+    ends = np.searchsorted(art_huid_all[order], ham_huid_arr, side="right").tolist()
+
+    art_type = art_sorted["type"].tolist()
+    art_path = art_sorted["path_rel"].tolist()
+    art_axis = column(art_sorted, "axis")
+    art_hmax = column(art_sorted, "Hmax_T")
+    art_ei = column(art_sorted, "Ei_meV")
+    art_n_hpts = column(art_sorted, "n_hpts")
+    art_nq = column(art_sorted, "nq")
+    art_nw = column(art_sorted, "nw")
+    art_keys = make_artifact_keys(art_sorted)
+    path_keys = ["path_" + k for k in art_keys]
 
     ham_nodes = []
     art_nodes = []
     art_data_sources = []
 
-    print(f"Preparing data for {len(ham_subset)} Hamiltonians...")
+    print(f"Preparing data for {len(ham_huids)} Hamiltonians...")
 
-    for _, ham_row in ham_subset.iterrows():
-        huid = str(ham_row["huid"])
+    for i, huid in enumerate(ham_huids):
         h_key = f"H_{huid[:8]}"
+        start, end = starts[i], ends[i]
+        art_range = range(start, end)
 
         # Build Hamiltonian metadata with paths
         metadata = {
             "huid": huid,
-            "Ja_meV": float(ham_row["Ja_meV"]),
-            "Jb_meV": float(ham_row["Jb_meV"]),
-            "Jc_meV": float(ham_row["Jc_meV"]),
-            "Dc_meV": float(ham_row["Dc_meV"]),
-            "spin_s": float(ham_row.get("spin_s", 2.5)),
-            "g_factor": float(ham_row.get("g_factor", 2.0)),
+            "Ja_meV": ham_Ja[i],
+            "Jb_meV": ham_Jb[i],
+            "Jc_meV": ham_Jc[i],
+            "Dc_meV": ham_Dc[i],
+            "spin_s": ham_spin[i],
+            "g_factor": ham_g[i],
         }
 
-        # Add artifact paths to metadata
-        artifacts = None
-        if huid in art_grouped.groups:
-            artifacts = art_grouped.get_group(huid)
-            for _, art_row in artifacts.iterrows():
-                path_key = make_artifact_key(art_row, prefix="path_")
-                metadata[path_key] = art_row["path_rel"]
+        # Add artifact paths to metadata (one update per Hamiltonian)
+        metadata.update(zip(path_keys[start:end], art_path[start:end]))
 
         ham_nodes.append({
             "key": h_key,
@@ -199,72 +422,59 @@ def prepare_node_data(ham_df, art_df, max_hamiltonians):
         })
 
         # Process artifacts for this Hamiltonian
-        if artifacts is not None:
-            for _, art_row in artifacts.iterrows():
-                art_key = make_artifact_key(art_row)
-                artifact_type = art_row["type"]
-                h5_rel_path = art_row["path_rel"]
-                h5_full_path = os.path.join(base_dir, h5_rel_path)
-
-                # Get shape
-                shape_default = default_shapes.get(artifact_type, [1])
-                if artifact_type == "mh_curve":
-                    data_shape = [int(art_row.get("n_hpts", shape_default[0]))]
-                elif artifact_type == "gs_state":
-                    data_shape = list(shape_default)
-                elif artifact_type == "ins_powder":
-                    data_shape = [
-                        int(art_row.get("nq", shape_default[0])),
-                        int(art_row.get("nw", shape_default[1])),
-                    ]
-                else:
-                    data_shape = list(shape_default)
-
-                # Build artifact metadata
-                art_metadata = {
-                    "type": artifact_type,
-                    "shape": data_shape,
-                    "dtype": "float64",
-                }
-                if artifact_type == "mh_curve":
-                    art_metadata["axis"] = art_row["axis"]
-                    art_metadata["Hmax_T"] = float(art_row["Hmax_T"])
-                elif artifact_type == "ins_powder":
-                    art_metadata["Ei_meV"] = float(art_row["Ei_meV"])
-
-                # Build structure for this artifact
-                # Chunks must be list of lists, one per dimension
-                chunks = [[dim] for dim in data_shape]
-                structure = {
-                    "data_type": {
-                        "endianness": "little",
-                        "kind": "f",
-                        "itemsize": 8,
-                    },
-                    "chunks": chunks,
-                    "shape": data_shape,
-                    "dims": None,
-                    "resizable": False,
-                }
-                structure_id = compute_structure_id(structure)
-
-                art_nodes.append({
-                    "key": art_key,
-                    "parent_huid": huid,  # For linking to parent
-                    "structure_family": "array",
-                    "metadata": art_metadata,
-                    "specs": [],
-                    "access_blob": {},
-                })
-
-                art_data_sources.append({
-                    "art_key": art_key,
-                    "parent_huid": huid,
-                    "structure_id": structure_id,
-                    "structure": structure,
-                    "h5_path": h5_full_path,
-                    "dataset_path": dataset_paths.get(artifact_type),
-                })
+        for j in art_range:
+            art_key = art_keys[j]
+            artifact_type = art_type[j]
+            h5_full_path = os.path.join(base_dir, art_path[j])
+
+            # Get shape (manifest column, falling back to config default)
+            shape_default = default_shapes.get(artifact_type, [1])
+            if artifact_type == "mh_curve":
+                n_hpts = art_n_hpts[j]
+                data_shape = [int(shape_default[0] if n_hpts is None else n_hpts)]
+            elif artifact_type == "gs_state":
+                data_shape = list(shape_default)
+            elif artifact_type == "ins_powder":
+                nq, nw = art_nq[j], art_nw[j]
+                data_shape = [
+                    int(shape_default[0] if nq is None else nq),
+                    int(shape_default[1] if nw is None else nw),
+                ]
+            else:
+                data_shape = list(shape_default)
+
+            # Build artifact metadata
+            art_metadata = {
+                "type": artifact_type,
+                "shape": data_shape,
+                "dtype": "float64",
+            }
+            if artifact_type == "mh_curve":
+                art_metadata["axis"] = art_axis[j]
+                art_metadata["Hmax_T"] = float(art_hmax[j])
+            elif artifact_type == "ins_powder":
+                art_metadata["Ei_meV"] = float(art_ei[j])
+
+            # Build structure for this artifact (shared per shape)
+            structure_id, structure = get_array_structure(data_shape)
+
+            art_nodes.append({
+                "key": art_key,
+                "parent_huid": huid,  # For linking to parent
+                "structure_family": "array",
+                "metadata": art_metadata,
+                "specs": [],
+                "access_blob": {},
+            })
+
+            art_data_sources.append({
+                "art_key": art_key,
+                "parent_huid": huid,
+                "structure_id": structure_id,
+                "structure": structure,
+                "h5_path": h5_full_path,
+                "dataset_path": dataset_paths.get(artifact_type),
+            })
 
     print(f"  Prepared {len(ham_nodes)} Hamiltonians, {len(art_nodes)} artifacts")
     return ham_nodes, art_nodes, art_data_sources
@@ -275,153 +485,125 @@ def bulk_register(engine, ham_nodes, art_nodes, art_data_sources):
 
     start_time = time.time()
 
-    with engine.connect() as conn:
+    with engine.connect() as conn, bulk_load_pragmas(conn), conn.begin():
+        # pysqlite defers BEGIN until the first DML statement; issue it here so
+        # the trigger DDL below is rolled back too if anything fails.
+        conn.exec_driver_sql("BEGIN")
+
         # Step 1: Disable closure table trigger
-        print("Step 1: Disabling closure table trigger...")
+        print("Step 1: Disabling closure table trigger and secondary indexes...")
         conn.execute(text("DROP TRIGGER IF EXISTS update_closure_table_when_inserting"))
+        saved_indexes = drop_secondary_indexes(conn)
+
+        # Row inserts go straight to the sqlite3 cursor: executemany binds one
+        # prepared statement over all rows in C. SQLAlchemy is kept for DDL.
+        cur = conn.connection.cursor()
 
         # Step 2: Insert Hamiltonian nodes
+        # Single executemany, then one SELECT to recover ids (keys are unique
+        # per parent, so key -> id is unambiguous). Rows are generated lazily
+        # so the serialized JSON never exists for all nodes at once.
         print(f"Step 2: Inserting {len(ham_nodes)} Hamiltonian nodes...")
-        ham_id_map = {}  # huid -> node_id
-
-        for ham in ham_nodes:
-            result = conn.execute(
-                text("""
-                    INSERT INTO nodes (parent, key, structure_family, metadata, specs, access_blob)
-                    VALUES (0, :key, :structure_family, :metadata, :specs, :access_blob)
-                """),
-                {
-                    "key": ham["key"],
-                    "structure_family": ham["structure_family"],
-                    "metadata": json.dumps(ham["metadata"]),
-                    "specs": json.dumps(ham["specs"]),
-                    "access_blob": json.dumps(ham["access_blob"]),
-                }
-            )
-            ham_id_map[ham["huid"]] = result.lastrowid
+        cur.executemany(
+            NODE_INSERT_SQL,
+            (
+                (
+                    0,
+                    ham["key"],
+                    ham["structure_family"],
+                    dumps(ham["metadata"]),
+                    dumps(ham["specs"]) if ham["specs"] else EMPTY_LIST_JSON,
+                    dumps(ham["access_blob"]) if ham["access_blob"] else EMPTY_DICT_JSON,
+                )
+                for ham in ham_nodes
+            ),
+        )
+        key_to_id = dict(cur.execute("SELECT key, id FROM nodes WHERE parent = 0"))
+        ham_id_map = {ham["huid"]: key_to_id[ham["key"]] for ham in ham_nodes}  # huid -> node_id
 
         # Step 3: Insert artifact nodes
         print(f"Step 3: Inserting {len(art_nodes)} artifact nodes...")
-        art_id_map = {}  # (huid, art_key) -> node_id
-
-        for art in art_nodes:
-            parent_id = ham_id_map[art["parent_huid"]]
-            result = conn.execute(
-                text("""
-                    INSERT INTO nodes (parent, key, structure_family, metadata, specs, access_blob)
-                    VALUES (:parent, :key, :structure_family, :metadata, :specs, :access_blob)
-                """),
-                {
-                    "parent": parent_id,
-                    "key": art["key"],
-                    "structure_family": art["structure_family"],
-                    "metadata": json.dumps(art["metadata"]),
-                    "specs": json.dumps(art["specs"]),
-                    "access_blob": json.dumps(art["access_blob"]),
-                }
+        cur.executemany(
+            NODE_INSERT_SQL,
+            (
+                (
+                    ham_id_map[art["parent_huid"]],
+                    art["key"],
+                    art["structure_family"],
+                    dumps(art["metadata"]),
+                    dumps(art["specs"]) if art["specs"] else EMPTY_LIST_JSON,
+                    dumps(art["access_blob"]) if art["access_blob"] else EMPTY_DICT_JSON,
+                )
+                for art in art_nodes
+            ),
+        )
+        parent_key_to_id = {
+            (parent, key): node_id
+            for node_id, parent, key in cur.execute(
+                "SELECT id, parent, key FROM nodes WHERE parent != 0"
             )
-            art_id_map[(art["parent_huid"], art["key"])] = result.lastrowid
+        }
+        art_id_map = {  # (huid, art_key) -> node_id
+            (art["parent_huid"], art["key"]): parent_key_to_id[
+                (ham_id_map[art["parent_huid"]], art["key"])
+            ]
+            for art in art_nodes
+        }
 
-        # Step 4: Insert structures (deduplicated)
+        # Step 4: Insert structures (deduplicated; only a few unique shapes)
         print("Step 4: Inserting structures...")
-        structures_seen = set()
+        unique_structures = {}
         for ds in art_data_sources:
-            sid = ds["structure_id"]
-            if sid not in structures_seen:
-                conn.execute(
-                    text("""
-                        INSERT OR IGNORE INTO structures (id, structure)
-                        VALUES (:id, :structure)
-                    """),
-                    {"id": sid, "structure": json.dumps(ds["structure"])}
+            unique_structures.setdefault(ds["structure_id"], ds["structure"])
+        cur.executemany(
+            STRUCT_INSERT_SQL,
+            [(sid, dumps(structure)) for sid, structure in unique_structures.items()],
+        )
+        print(f"  Inserted {len(unique_structures)} unique structures")
+
+        # Steps 5-7 are derived in SQL from one staging table: one row per
+        # artifact node (each has exactly one data source), loaded once.
+        cur.execute(TMP_ART_CREATE_SQL)
+        cur.executemany(
+            TMP_ART_INSERT_SQL,
+            (
+                (
+                    art_id_map[(ds["parent_huid"], ds["art_key"])],
+                    ds["structure_id"],
+                    f"file://localhost{ds['h5_path']}",
+                    dumps({"dataset": ds["dataset_path"]}),
                 )
-                structures_seen.add(sid)
-        print(f"  Inserted {len(structures_seen)} unique structures")
+                for ds in art_data_sources
+            ),
+        )
 
-        # Step 5: Insert assets (deduplicated by data_uri)
+        # Step 5: Insert assets (deduplicated by data_uri, first-seen order)
         print("Step 5: Inserting assets...")
-        asset_id_map = {}  # data_uri -> asset_id
-
-        for ds in art_data_sources:
-            data_uri = f"file://localhost{ds['h5_path']}"
-            if data_uri not in asset_id_map:
-                result = conn.execute(
-                    text("""
-                        INSERT OR IGNORE INTO assets (data_uri, is_directory)
-                        VALUES (:data_uri, 0)
-                    """),
-                    {"data_uri": data_uri}
-                )
-                # Get the ID (either from insert or existing)
-                existing = conn.execute(
-                    text("SELECT id FROM assets WHERE data_uri = :data_uri"),
-                    {"data_uri": data_uri}
-                ).fetchone()
-                asset_id_map[data_uri] = existing[0]
-        print(f"  Inserted {len(asset_id_map)} unique assets")
+        cur.execute(ASSET_INSERT_SQL)
+        print(f"  Inserted {cur.rowcount} unique assets")
 
         # Step 6: Insert data_sources
         print("Step 6: Inserting data sources...")
-        ds_id_map = {}  # (huid, art_key) -> data_source_id
-
-        for ds in art_data_sources:
-            node_id = art_id_map[(ds["parent_huid"], ds["art_key"])]
-            result = conn.execute(
-                text("""
-                    INSERT INTO data_sources (node_id, structure_id, mimetype, parameters, management, structure_family)
-                    VALUES (:node_id, :structure_id, :mimetype, :parameters, :management, :structure_family)
-                """),
-                {
-                    "node_id": node_id,
-                    "structure_id": ds["structure_id"],
-                    "mimetype": "application/x-hdf5",
-                    "parameters": json.dumps({"dataset": ds["dataset_path"]}),
-                    "management": "external",
-                    "structure_family": "array",
-                }
-            )
-            ds_id_map[(ds["parent_huid"], ds["art_key"])] = result.lastrowid
+        cur.execute(DS_INSERT_SQL)
 
         # Step 7: Insert data_source_asset_association
         print("Step 7: Inserting data source asset associations...")
-        for ds in art_data_sources:
-            ds_id = ds_id_map[(ds["parent_huid"], ds["art_key"])]
-            data_uri = f"file://localhost{ds['h5_path']}"
-            asset_id = asset_id_map[data_uri]
-            conn.execute(
-                text("""
-                    INSERT INTO data_source_asset_association (data_source_id, asset_id, parameter, num)
-                    VALUES (:ds_id, :asset_id, :parameter, NULL)
-                """),
-                {"ds_id": ds_id, "asset_id": asset_id, "parameter": "data_uris"}
-            )
+        cur.execute(ASSOC_INSERT_SQL)
+        cur.execute("DROP TABLE tmp_art")
 
-        # Step 8: Rebuild closure table
-        print("Step 8: Rebuilding closure table...")
+        # Step 8: Rebuild indexes and closure table
+        # Node indexes come back first: the recursive CTE joins on nodes.parent
+        print("Step 8: Rebuilding indexes and closure table...")
+        for table, index_sql in saved_indexes.items():
+            if table != "nodes_closure":
+                create_indexes(conn, index_sql)
 
         # Clear existing data (root node was auto-inserted)
         conn.execute(text("DELETE FROM nodes_closure"))
 
-        # Self-references (depth=0)
-        conn.execute(text("""
-            INSERT INTO nodes_closure (ancestor, descendant, depth)
-            SELECT id, id, 0 FROM nodes
-        """))
-
-        # Parent-child (depth=1)
-        conn.execute(text("""
-            INSERT INTO nodes_closure (ancestor, descendant, depth)
-            SELECT parent, id, 1 FROM nodes WHERE parent IS NOT NULL
-        """))
-
-        # Grandparent (depth=2) - for 2-level hierarchy
-        conn.execute(text("""
-            INSERT INTO nodes_closure (ancestor, descendant, depth)
-            SELECT gp.parent, n.id, 2
-            FROM nodes n
-            JOIN nodes gp ON n.parent = gp.id
-            WHERE gp.parent IS NOT NULL
-        """))
+        conn.execute(text(CLOSURE_REBUILD_SQL))
+
+        create_indexes(conn, saved_indexes.get("nodes_closure", []))
 
         # Verify closure table
         closure_count = conn.execute(text("SELECT COUNT(*) FROM nodes_closure")).fetchone()[0]
@@ -431,9 +613,6 @@ def bulk_register(engine, ham_nodes, art_nodes, art_data_sources):
         print("Step 9: Re-enabling closure table trigger...")
         conn.execute(text(CLOSURE_TRIGGER_SQL))
 
-        # Commit everything
-        conn.commit()
-
     elapsed = time.time() - start_time
     print(f"\nBulk registration complete in {elapsed:.1f} seconds")
     return elapsed
@@ -463,28 +642,28 @@ def verify_registration(db_path):
         print(f"  assets:         {assets}")
         print(f"  associations:   {associations}")
 
-        # Sample a Hamiltonian
+        # Sample a Hamiltonian; metadata checks run inside SQLite (JSON1)
+        # instead of decoding the whole metadata blob in Python.
         ham = conn.execute(text("""
-            SELECT id, key, metadata FROM nodes
-            WHERE parent = 0 AND key != ''
+            SELECT
+                n.key,
+                json_extract(n.metadata, '$.Ja_meV'),
+                json_extract(n.metadata, '$.Jb_meV'),
+                (SELECT COUNT(*) FROM nodes c WHERE c.parent = n.id),
+                (SELECT COUNT(*) FROM json_each(n.metadata) m
+                 WHERE substr(m.key, 1, 5) = 'path_')
+            FROM nodes n
+            WHERE n.parent = 0 AND n.key != ''
             LIMIT 1
         """)).fetchone()
 
         if ham:
-            print(f"\nSample Hamiltonian: {ham[1]}")
-            meta = json.loads(ham[2])
-            print(f"  Ja_meV: {meta.get('Ja_meV')}")
-            print(f"  Jb_meV: {meta.get('Jb_meV')}")
-
-            # Count children
-            children = conn.execute(text("""
-                SELECT COUNT(*) FROM nodes WHERE parent = :parent_id
-            """), {"parent_id": ham[0]}).fetchone()[0]
+            h_key, ja, jb, children, n_path_keys = ham
+            print(f"\nSample Hamiltonian: {h_key}")
+            print(f"  Ja_meV: {ja}")
+            print(f"  Jb_meV: {jb}")
             print(f"  Children: {children}")
-
-            # Check path keys in metadata
-            path_keys = [k for k in meta.keys() if k.startswith("path_")]
-            print(f"  Path keys: {len(path_keys)}")
+            print(f"  Path keys: {n_path_keys}")
 
     print("\n" + "=" * 50)
     print("To test with Tiled server:")
@@ -589,7 +768,7 @@ def main():
     engine = init_database(db_path)
 
     # Load manifests
-    ham_df, art_df = load_manifests()
+    ham_df, art_df = load_manifests(max_hamiltonians)
 
     # Prepare data
     ham_nodes, art_nodes, art_data_sources = prepare_node_data(
@@ -2,11 +2,15 @@
 VDP Configuration Module.
 
 Loads configuration from config.yml and provides accessor functions.
-Uses ruamel.yaml to preserve comments for round-trip editing.
+The config is read-only here, so it is parsed with ruamel.yaml's safe
+loader (libyaml-backed when ruamel.yaml.clib is installed) into plain
+dicts rather than round-trip comment-preserving maps.
 """
 
 import os
+import copy
 import glob
+import functools
 from pathlib import Path
 from ruamel.yaml import YAML
 
@@ -15,24 +19,37 @@ from ruamel.yaml import YAML
 _config = None
 _config_path = None
 
+# Safe (non round-trip) loader, created once and reused for every load
+_yaml = YAML(typ="safe")
+
+
+@functools.lru_cache(maxsize=32)
+def _load_config_file(path, mtime_ns, size):
+    """Parse a config file; mtime_ns and size are part of the cache key."""
+    with open(path) as f:
+        full_config = _yaml.load(f)
+
+    return (full_config or {}).get("vdp", {})
+
 
 def load_config(config_path=None):
     """Load VDP config from YAML file.
 
+    Parsed files are cached by (path, mtime, size), so repeated loads of an
+    unchanged file skip the YAML parse; editing the file invalidates it.
+
     Args:
         config_path: Path to config.yml. Defaults to config.yml in parent directory.
 
     Returns:
-        dict: The 'vdp' section of the config file.
+        dict: The 'vdp' section of the config file (a fresh copy per call).
     """
     if config_path is None:
         config_path = Path(__file__).parent.parent / "config.yml"
 
-    yaml = YAML()
-    with open(config_path) as f:
-        full_config = yaml.load(f)
-
-    return full_config.get("vdp", {})
+    path = os.path.abspath(config_path)
+    st = os.stat(path)
+    return copy.deepcopy(_load_config_file(path, st.st_mtime_ns, st.st_size))
 
 
 def get_config():
@@ -103,3 +120,9 @@ def get_max_hamiltonians():
     """Get max Hamiltonians to register (from env or config)."""
     default = get_config().get("max_hamiltonians", 10)
     return int(os.environ.get("VDP_MAX_HAMILTONIANS", default))
+
+
+def get_register_workers():
+    """Get number of concurrent HTTP registration workers (from env or config)."""
+    default = get_config().get("register_workers", 8)
+    return int(os.environ.get("VDP_REGISTER_WORKERS", default))
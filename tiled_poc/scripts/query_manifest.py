@@ -36,12 +36,45 @@ Usage:
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
+
 import h5py
 import numpy as np
 import pandas as pd
 from tiled.queries import Key
 
-from config import get_base_dir, get_dataset_paths, get_tiled_url, get_api_key
+from config import get_base_dir, get_dataset_paths, get_tiled_url
+from utils import connect_client
+
+# Hamiltonians per search request (the Tiled server's default page size)
+# and how many of those pages query_manifest fetches concurrently
+METADATA_PAGE_SIZE = 100
+METADATA_WORKERS = 8
+
+MANIFEST_COLUMNS = [
+    "huid", "h_key", "Ja_meV", "Jb_meV", "Jc_meV", "Dc_meV",
+    "spin_s", "g_factor", "path_rel",
+]
+
+
+def fetch_metadata(results):
+    """
+    Fetch (key, metadata) pairs for every entry in a Tiled container.
+
+    Each page of search results already carries the entries' metadata, so
+    the cost is one HTTP round trip per page; pages are requested
+    concurrently and returned in catalog order.
+    """
+    items = results.items()
+    starts = range(0, len(results), METADATA_PAGE_SIZE)
+
+    def fetch_page(start):
+        page = items[start:start + METADATA_PAGE_SIZE]
+        return [(key, h.metadata) for key, h in page]
+
+    with ThreadPoolExecutor(max_workers=METADATA_WORKERS) as executor:
+        pages = executor.map(fetch_page, starts)
+        return [pair for page in pages for pair in page]
 
 
 def query_manifest(client, *, artifact_type="mh_curve", axis=None, Hmax_T=None,
@@ -100,28 +133,25 @@ def query_manifest(client, *, artifact_type="mh_curve", axis=None, Hmax_T=None,
         raise ValueError(f"Unknown artifact_type: {artifact_type}")
 
     # Extract manifest rows from query results
-    # Use .items() for batch fetching (9-12x faster than per-key lookup)
-    rows = []
-    for h_key, h in results.items():
-        meta = h.metadata
+    # Fetch whole pages (9-12x faster than per-key lookup), several at a time
+    columns = {name: [] for name in MANIFEST_COLUMNS}
+    for h_key, meta in fetch_metadata(results):
         path_rel = meta.get(path_key)
 
         if path_rel is None:
             continue  # Skip if this artifact type doesn't exist
 
-        rows.append({
-            "huid": meta["huid"],
-            "h_key": h_key,
-            "Ja_meV": meta["Ja_meV"],
-            "Jb_meV": meta["Jb_meV"],
-            "Jc_meV": meta["Jc_meV"],
-            "Dc_meV": meta["Dc_meV"],
-            "spin_s": meta.get("spin_s", 2.5),
-            "g_factor": meta.get("g_factor", 2.0),
-            "path_rel": path_rel,
-        })
+        columns["huid"].append(meta["huid"])
+        columns["h_key"].append(h_key)
+        columns["Ja_meV"].append(meta["Ja_meV"])
+        columns["Jb_meV"].append(meta["Jb_meV"])
+        columns["Jc_meV"].append(meta["Jc_meV"])
+        columns["Dc_meV"].append(meta["Dc_meV"])
+        columns["spin_s"].append(meta.get("spin_s", 2.5))
+        columns["g_factor"].append(meta.get("g_factor", 2.0))
+        columns["path_rel"].append(path_rel)
 
-    return pd.DataFrame(rows)
+    return pd.DataFrame(columns)
 
 
 def load_from_manifest(manifest_df, *, artifact_type="mh_curve", clamp_H0=True,
@@ -147,48 +177,45 @@ def load_from_manifest(manifest_df, *, artifact_type="mh_curve", clamp_H0=True,
     if dataset_path is None:
         raise ValueError(f"Unknown artifact_type: {artifact_type}")
 
-    X_list = []
-    Theta_list = []
+    # Keep rows whose file exists, in manifest order (one stat per file)
+    path_rel = manifest_df.get("path_rel")
+    if path_rel is None:
+        raise ValueError("No data loaded from manifest")
+    paths = {p: os.path.join(base_dir, p) for p in path_rel.dropna().unique()}
+    paths = {p: path for p, path in paths.items() if os.path.exists(path)}
+    rows = manifest_df[path_rel.isin(list(paths))]
 
-    for _, row in manifest_df.iterrows():
-        path_rel = row.get("path_rel")
-        if path_rel is None:
-            continue
-
-        path = os.path.join(base_dir, path_rel)
-        if not os.path.exists(path):
-            continue
-
-        with h5py.File(path, "r") as f:
-            data = f[dataset_path][:]
-
-        # Normalize for mh_curve
-        if artifact_type == "mh_curve":
-            spin_s = row.get("spin_s", 2.5)
-            g_factor = row.get("g_factor", 2.0)
-            Msat = g_factor * spin_s
-
-            if clamp_H0:
-                data = data.copy()
-                data[0] = 0.0
-
-            data = data / Msat
-
-        X_list.append(data)
-        Theta_list.append([
-            row["Ja_meV"],
-            row["Jb_meV"],
-            row["Jc_meV"],
-            row["Dc_meV"],
-            row.get("spin_s", 2.5),
-            row.get("g_factor", 2.0),
-        ])
-
-    if not X_list:
+    if rows.empty:
         raise ValueError("No data loaded from manifest")
 
-    X = np.stack(X_list, dtype=np.float32)
-    Theta = np.array(Theta_list, dtype=np.float32)
+    # One open per file, however many manifest rows point at it. HDF5
+    # converts to float32 while reading straight into the output block.
+    X = None
+    for p, positions in rows.groupby("path_rel", sort=False).indices.items():
+        # Read-only: skip HDF5 file locking (costly on NFS/Lustre)
+        with h5py.File(paths[p], "r", locking=False) as f:
+            dataset = f[dataset_path]
+            if X is None:
+                X = np.empty((len(rows), *dataset.shape), dtype=np.float32)
+            dataset.read_direct(X, dest_sel=np.s_[positions[0]])
+
+        X[positions[1:]] = X[positions[0]]
+
+    spin_s = np.broadcast_to(rows.get("spin_s", 2.5), len(rows))
+    g_factor = np.broadcast_to(rows.get("g_factor", 2.0), len(rows))
+
+    # Normalize for mh_curve, in place on the whole block
+    if artifact_type == "mh_curve":
+        if clamp_H0:
+            X[:, 0] = 0.0
+
+        Msat = g_factor * spin_s
+        X /= Msat[:, None]
+
+    Theta = np.empty((len(rows), 6), dtype=np.float32)
+    Theta[:, :4] = rows[["Ja_meV", "Jb_meV", "Jc_meV", "Dc_meV"]].to_numpy()
+    Theta[:, 4] = spin_s
+    Theta[:, 5] = g_factor
 
     return X, Theta
 
@@ -268,10 +295,8 @@ def build_ins_dataset(client, *, Ei_meV=12, **filters):
 def main():
     """Demo: Query and load M(H) dataset."""
     import time
-    from tiled.client import from_uri
 
     tiled_url = get_tiled_url()
-    api_key = get_api_key()
 
     print("=" * 60)
     print("V6 Discovery API Demo (Expert Mode)")
@@ -279,7 +304,7 @@ def main():
 
     # Connect to Tiled
     print(f"Connecting to {tiled_url}...")
-    client = from_uri(tiled_url, api_key=api_key)
+    client = connect_client()
     print(f"Catalog contains {len(client)} Hamiltonians")
 
     # Query manifest
@@ -36,26 +36,52 @@ Usage:
 import os
 import sys
 import time
+import functools
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 import numpy as np
-import pandas as pd
+from tiled.structures.array import ArrayStructure
+from tiled.structures.core import StructureFamily
+from tiled.structures.data_source import Asset, DataSource, Management
 
 from config import (
     get_base_dir,
     get_latest_manifest,
     get_tiled_url,
-    get_api_key,
     get_max_hamiltonians,
+    get_register_workers,
     get_dataset_paths,
     get_default_shapes,
     get_service_dir,
 )
-from utils import check_server, make_artifact_key
+from utils import (
+    ART_COLUMNS,
+    HAM_COLUMNS,
+    check_server,
+    connect_client,
+    iter_records,
+    make_artifact_keys,
+    read_manifest,
+)
+
+
+# Minimum seconds between progress lines during registration
+PROGRESS_INTERVAL = 2.0
+
+# Abort registration once this many artifacts have failed. Transient HTTP
+# errors (connection resets, 5xx, 429) are already retried with backoff
+# inside the Tiled client, so failures reaching us are persistent. A failed
+# container (create_container raising) aborts at once, without waiting for
+# this limit; either way queued Hamiltonians are cancelled.
+MAX_ARTIFACT_ERRORS = 20
 
 
-def load_manifests():
-    """Load Hamiltonian and Artifact manifests."""
+def load_manifests(max_hamiltonians=None):
+    """Load Hamiltonian and Artifact manifests (only the columns we use).
+
+    If max_hamiltonians is given, only that many Hamiltonian rows are read.
+    """
     base_dir = get_base_dir()
     print(f"Loading manifests from {base_dir}...")
 
@@ -65,20 +91,29 @@ def load_manifests():
     print(f"  Hamiltonians: {Path(ham_path).name}")
     print(f"  Artifacts:    {Path(art_path).name}")
 
-    ham_df = pd.read_parquet(ham_path)
-    art_df = pd.read_parquet(art_path)
+    ham_df = read_manifest(ham_path, HAM_COLUMNS, max_rows=max_hamiltonians)
+    art_df = read_manifest(art_path, ART_COLUMNS)
 
     print(f"  Rows: {len(ham_df)} Hamiltonians, {len(art_df)} artifacts")
 
     return ham_df, art_df
 
 
+@functools.lru_cache(maxsize=256)
+def array_structure(data_shape, dtype_str):
+    """ArrayStructure for a shape/dtype, built once and shared (it is read-only).
+
+    from_array() only needs the dtype and shape, so it is given an empty
+    0-length array plus an explicit shape instead of a full-size buffer
+    (chunks are still normalized exactly as for a real array).
+    """
+    return ArrayStructure.from_array(
+        np.empty(0, dtype=np.dtype(dtype_str)), shape=data_shape
+    )
+
+
 def create_data_source(art_row):
     """Create a DataSource for an artifact pointing to external HDF5."""
-    from tiled.structures.core import StructureFamily
-    from tiled.structures.array import ArrayStructure
-    from tiled.structures.data_source import Asset, DataSource, Management
-
     base_dir = get_base_dir()
     dataset_paths = get_dataset_paths()
     default_shapes = get_default_shapes()
@@ -92,16 +127,18 @@ def create_data_source(art_row):
     if not dataset_path:
         raise ValueError(f"Unknown artifact type: {artifact_type}")
 
-    # Get shape from config defaults or row
+    # Get shape from row, falling back to config defaults (absent or None)
     shape_default = default_shapes.get(artifact_type, [1])
     if artifact_type == "mh_curve":
-        data_shape = (int(art_row.get("n_hpts", shape_default[0])),)
+        n_hpts = art_row.get("n_hpts")
+        data_shape = (int(shape_default[0] if n_hpts is None else n_hpts),)
     elif artifact_type == "gs_state":
         data_shape = tuple(shape_default)
     elif artifact_type == "ins_powder":
+        nq, nw = art_row.get("nq"), art_row.get("nw")
         data_shape = (
-            int(art_row.get("nq", shape_default[0])),
-            int(art_row.get("nw", shape_default[1])),
+            int(shape_default[0] if nq is None else nq),
+            int(shape_default[1] if nw is None else nw),
         )
     else:
         data_shape = tuple(shape_default)
@@ -115,10 +152,8 @@ def create_data_source(art_row):
         parameter="data_uris",
     )
 
-    # Create array structure
-    structure = ArrayStructure.from_array(
-        np.empty(data_shape, dtype=data_dtype)
-    )
+    # Array structure (cached per shape: identical for most artifacts)
+    structure = array_structure(data_shape, np.dtype(data_dtype).str)
 
     # Create data source
     data_source = DataSource(
@@ -133,108 +168,178 @@ def create_data_source(art_row):
     return data_source, data_shape, data_dtype
 
 
-def register_unified_catalog(client, ham_df, art_df):
+def register_hamiltonian(client, ham_row, artifacts):
+    """Register one Hamiltonian container and its artifact children.
+
+    Runs on a worker thread; all HTTP calls for one container stay on the
+    same thread, so its children are created in manifest order. The caller
+    is responsible for skipping keys that already exist.
+
+    Args:
+        client: Tiled client for the catalog root.
+        ham_row: Hamiltonian manifest record (dict).
+        artifacts: List of this Hamiltonian's artifact records (dicts), each
+            carrying its precomputed child key under "art_key".
+
+    Returns:
+        tuple: (n_registered, n_failed) artifact counts.
+    """
+    huid = str(ham_row["huid"])
+    h_key = f"H_{huid[:8]}"
+    spin_s = ham_row.get("spin_s")
+    g_factor = ham_row.get("g_factor")
+
+    # Build metadata with physics parameters
+    metadata = {
+        "huid": huid,
+        "Ja_meV": float(ham_row["Ja_meV"]),
+        "Jb_meV": float(ham_row["Jb_meV"]),
+        "Jc_meV": float(ham_row["Jc_meV"]),
+        "Dc_meV": float(ham_row["Dc_meV"]),
+        "spin_s": float(2.5 if spin_s is None else spin_s),
+        "g_factor": float(2.0 if g_factor is None else g_factor),
+    }
+
+    # V6 ADDITION: Add artifact paths to metadata (V5 pattern)
+    metadata.update(
+        (f"path_{art_row['art_key']}", art_row["path_rel"]) for art_row in artifacts
+    )
+
+    # Create container with enriched metadata
+    h_container = client.create_container(key=h_key, metadata=metadata)
+
+    # V6: Also register arrays as children (V4 pattern)
+    art_count = 0
+    error_count = 0
+    for art_row in artifacts:
+        art_key = art_row["art_key"]
+        try:
+            # Create data source pointing to external HDF5
+            data_source, data_shape, data_dtype = create_data_source(art_row)
+
+            # Build artifact-specific metadata
+            art_metadata = {
+                "type": art_row["type"],
+                "shape": list(data_shape),
+                "dtype": str(data_dtype),
+            }
+
+            # Add type-specific metadata
+            if art_row["type"] == "mh_curve":
+                art_metadata["axis"] = art_row["axis"]
+                art_metadata["Hmax_T"] = float(art_row["Hmax_T"])
+            elif art_row["type"] == "ins_powder":
+                art_metadata["Ei_meV"] = float(art_row["Ei_meV"])
+
+            # Register artifact as child of container
+            h_container.new(
+                structure_family=StructureFamily.array,
+                data_sources=[data_source],
+                key=art_key,
+                metadata=art_metadata,
+            )
+            art_count += 1
+
+        except Exception as e:
+            error_count += 1
+            print(f"  ERROR registering artifact {h_key}/{art_key}: {e}")
+
+    return art_count, error_count
+
+
+def register_unified_catalog(client, ham_df, art_df, max_workers=None):
     """Register Hamiltonians with BOTH paths AND array adapters.
 
     V6 UNIFIED: Combines V4 (adapters) + V5 (paths in metadata).
     Users choose their access pattern at query time.
-    """
-    from tiled.structures.core import StructureFamily
 
-    base_dir = get_base_dir()
+    Registration is network-bound, so Hamiltonians are registered
+    concurrently on a thread pool (max_workers, default from config).
+    """
     max_hamiltonians = get_max_hamiltonians()
+    if max_workers is None:
+        max_workers = get_register_workers()
 
     start_time = time.time()
     ham_count = 0
     art_count = 0
     skip_count = 0
-
-    # Pre-group artifacts by huid for O(1) lookup
-    print("Pre-grouping artifacts by huid...")
-    art_grouped = art_df.groupby("huid")
+    error_count = 0
 
     # Limit Hamiltonians
     ham_subset = ham_df.head(max_hamiltonians)
-    print(f"Registering {len(ham_subset)} Hamiltonians (unified: paths + adapters)...")
-
-    for i, (_, ham_row) in enumerate(ham_subset.iterrows()):
-        huid = str(ham_row["huid"])
-        h_key = f"H_{huid[:8]}"
-
-        # Skip if container already exists
-        if h_key in client:
-            skip_count += 1
-            continue
-
-        # Build metadata with physics parameters
-        metadata = {
-            "huid": huid,
-            "Ja_meV": float(ham_row["Ja_meV"]),
-            "Jb_meV": float(ham_row["Jb_meV"]),
-            "Jc_meV": float(ham_row["Jc_meV"]),
-            "Dc_meV": float(ham_row["Dc_meV"]),
-            "spin_s": float(ham_row.get("spin_s", 2.5)),
-            "g_factor": float(ham_row.get("g_factor", 2.0)),
-        }
-
-        # V6 ADDITION: Add artifact paths to metadata (V5 pattern)
-        artifacts = None
-        if huid in art_grouped.groups:
-            artifacts = art_grouped.get_group(huid)
-            for _, art_row in artifacts.iterrows():
-                path_key = make_artifact_key(art_row, prefix="path_")
-                metadata[path_key] = art_row["path_rel"]
-
-        # Create container with enriched metadata
-        h_container = client.create_container(key=h_key, metadata=metadata)
-        ham_count += 1
-
-        # V6: Also register arrays as children (V4 pattern)
-        if artifacts is not None:
-            for _, art_row in artifacts.iterrows():
-                try:
-                    art_key = make_artifact_key(art_row)
-
-                    # Create data source pointing to external HDF5
-                    data_source, data_shape, data_dtype = create_data_source(art_row)
-
-                    # Build artifact-specific metadata
-                    art_metadata = {
-                        "type": art_row["type"],
-                        "shape": list(data_shape),
-                        "dtype": str(data_dtype),
-                    }
-
-                    # Add type-specific metadata
-                    if art_row["type"] == "mh_curve":
-                        art_metadata["axis"] = art_row["axis"]
-                        art_metadata["Hmax_T"] = float(art_row["Hmax_T"])
-                    elif art_row["type"] == "ins_powder":
-                        art_metadata["Ei_meV"] = float(art_row["Ei_meV"])
-
-                    # Register artifact as child of container
-                    h_container.new(
-                        structure_family=StructureFamily.array,
-                        data_sources=[data_source],
-                        key=art_key,
-                        metadata=art_metadata,
-                    )
-                    art_count += 1
+    n_total = len(ham_subset)
 
-                except Exception as e:
-                    print(f"  ERROR registering artifact {art_key}: {e}")
+    # Pre-group the selected Hamiltonians' artifacts by huid as plain records
+    # (manifest order kept), converted batch by batch through Arrow. Child
+    # keys are generated for them all at once and stored on each record.
+    print("Pre-grouping artifacts by huid...")
+    art_subset = art_df[art_df["huid"].astype(str).isin(ham_subset["huid"].astype(str))]
+    art_by_huid = {}
+    art_keys = make_artifact_keys(art_subset)
+    for art_key, art_row in zip(art_keys, iter_records(art_subset)):
+        art_row["art_key"] = art_key
+        art_by_huid.setdefault(str(art_row["huid"]), []).append(art_row)
+
+    print(f"Registering {n_total} Hamiltonians (unified: paths + adapters, "
+          f"{max_workers} workers)...")
+
+    # Existing container keys, fetched once (paged) instead of one
+    # existence request per Hamiltonian
+    existing_keys = set(client.keys())
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            futures = []
+            for ham_row in iter_records(ham_subset):
+                huid = str(ham_row["huid"])
+                h_key = f"H_{huid[:8]}"
+
+                # Skip if container already exists (or was already submitted)
+                if h_key in existing_keys:
+                    skip_count += 1
+                    continue
+                existing_keys.add(h_key)
+
+                artifacts = art_by_huid.get(huid, [])
+                futures.append(
+                    executor.submit(register_hamiltonian, client, ham_row, artifacts)
+                )
+
+            # Counters are only touched here, on the main thread
+            next_report = start_time + PROGRESS_INTERVAL
+            for i, future in enumerate(as_completed(futures), start=skip_count):
+                n_registered, n_failed = future.result()
+                art_count += n_registered
+                error_count += n_failed
+                ham_count += 1
+
+                # Circuit breaker: cancel queued work once failures pile up
+                if error_count > MAX_ARTIFACT_ERRORS:
+                    raise RuntimeError(
+                        f"Aborting registration: {error_count} artifacts failed "
+                        f"(limit {MAX_ARTIFACT_ERRORS})"
+                    )
 
-        # Progress update
-        if (i + 1) % 5 == 0 or (i + 1) == len(ham_subset):
-            elapsed = time.time() - start_time
-            rate = (i + 1) / elapsed if elapsed > 0 else 0
-            print(f"  Progress: {i+1}/{len(ham_subset)} Hamiltonians ({rate:.1f}/sec)")
+                # Progress update, throttled by wall clock rather than count
+                now = time.time()
+                if now >= next_report or (i + 1) == n_total:
+                    next_report = now + PROGRESS_INTERVAL
+                    elapsed = now - start_time
+                    rate = (i + 1) / elapsed if elapsed > 0 else 0
+                    print(f"  Progress: {i+1}/{n_total} Hamiltonians ({rate:.1f}/sec)")
+        except BaseException:
+            # Any error or Ctrl-C: drop queued Hamiltonians instead of letting
+            # the pool send them all before the exception surfaces
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
 
     elapsed_total = time.time() - start_time
     print(f"\nRegistration complete:")
     print(f"  Hamiltonians: {ham_count}")
     print(f"  Artifacts:    {art_count}")
     print(f"  Skipped:      {skip_count}")
+    print(f"  Failed:       {error_count} artifacts")
     print(f"  Time:         {elapsed_total:.1f} seconds")
 
     return ham_count > 0
@@ -332,12 +437,13 @@ def main():
         sys.exit(1)
     print("Server is running")
 
+    # One client for the whole run, with at least one pooled connection per
+    # worker so no worker waits on the pool
+    client = connect_client(max_connections=max(get_register_workers(), 16))
+
     # Load manifests
-    ham_df, art_df = load_manifests()
+    ham_df, art_df = load_manifests(max_hamiltonians)
 
-    # Import tiled here (after server check)
-    from tiled.client import from_uri
-    client = from_uri(tiled_url, api_key=get_api_key())
     print(f"Current catalog containers: {len(client)}")
 
     # Register unified catalog
@@ -4,6 +4,8 @@ VDP Shared Utilities.
 Common functions used across VDP scripts.
 """
 
+import functools
+
 from config import get_tiled_url, get_api_key
 
 
@@ -30,6 +32,98 @@ def check_server():
         return False
 
 
+@functools.lru_cache(maxsize=None)
+def _connect(url, api_key, max_connections):
+    from tiled.client import from_uri
+
+    return from_uri(url, api_key=api_key, max_connections=max_connections)
+
+
+def connect_client(max_connections=16):
+    """Connect to the Tiled server, reusing one client per (url, api_key).
+
+    The client keeps its HTTP connection pool open, so repeated calls (and
+    everything done through the returned client) share connections instead
+    of re-handshaking. Call check_server() first for a quick, retry-free
+    reachability test.
+
+    Args:
+        max_connections: Size of the client's keep-alive connection pool,
+            which also caps concurrent requests (Tiled's default is 16).
+            Set it to at least the number of threads sharing the client.
+
+    Returns:
+        tiled.client container for the catalog root.
+
+    Raises:
+        Exception: Whatever from_uri raises if the server is unreachable
+            (failures are not cached).
+    """
+    return _connect(get_tiled_url(), get_api_key(), max_connections)
+
+
+# Manifest columns the registration scripts actually read
+HAM_COLUMNS = ["huid", "Ja_meV", "Jb_meV", "Jc_meV", "Dc_meV", "spin_s", "g_factor"]
+ART_COLUMNS = ["huid", "type", "path_rel", "axis", "Hmax_T", "Ei_meV", "n_hpts", "nq", "nw"]
+
+
+def read_manifest(path, columns=None, max_rows=None):
+    """Read a Parquet manifest, decoding only the requested columns.
+
+    Args:
+        path: Path to the manifest Parquet file.
+        columns: Column names to read, or None for all. Names missing from
+            the file are skipped, so optional columns can be listed freely.
+        max_rows: If given, stop after the first max_rows rows instead of
+            decoding the whole file (equivalent to .head(max_rows)).
+
+    Returns:
+        DataFrame with the selected columns.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    pf = pq.ParquetFile(path)
+    if columns is not None:
+        available = set(pf.schema_arrow.names)
+        columns = [c for c in columns if c in available]
+
+    if max_rows is None:
+        return pf.read(columns=columns).to_pandas()
+
+    # Batches stop at row-group boundaries, so collect until we have enough
+    batches = []
+    n_rows = 0
+    for batch in pf.iter_batches(batch_size=max(max_rows, 1), columns=columns):
+        batches.append(batch)
+        n_rows += batch.num_rows
+        if n_rows >= max_rows:
+            break
+    if not batches:
+        return pf.read(columns=columns).to_pandas().head(max_rows)
+    return pa.Table.from_batches(batches).slice(0, max_rows).to_pandas()
+
+
+def iter_records(df, batch_size=4096):
+    """Yield DataFrame rows as plain dicts, converted in Arrow batches.
+
+    Much faster than iterrows() or to_dict("records") for large manifests.
+    Missing values (NaN/None) come back as None.
+
+    Args:
+        df: pandas DataFrame.
+        batch_size: Rows converted per Arrow record batch.
+
+    Yields:
+        dict: One row, column name -> native Python value.
+    """
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for batch in table.to_batches(max_chunksize=batch_size):
+        yield from batch.to_pylist()
+
+
 def make_artifact_key(art_row, prefix=""):
     """Generate key for artifact.
 
@@ -59,3 +153,38 @@ def make_artifact_key(art_row, prefix=""):
         raise ValueError(f"Unknown artifact type: {artifact_type}")
 
     return f"{prefix}{key}" if prefix else key
+
+
+def make_artifact_keys(art_df, prefix=""):
+    """Generate keys for every artifact row at once.
+
+    Column-wise equivalent of make_artifact_key(), for use on whole
+    manifests instead of calling it once per row.
+
+    Args:
+        art_df: Artifact DataFrame (type, axis, Hmax_T, Ei_meV columns).
+        prefix: Optional prefix (e.g., "path_" for metadata keys).
+
+    Returns:
+        list[str]: One key per row, in row order.
+    """
+    types = art_df["type"].astype(str)
+    is_mh = types == "mh_curve"
+    is_ins = types == "ins_powder"
+
+    unknown = ~(is_mh | is_ins | (types == "gs_state"))
+    if unknown.any():
+        raise ValueError(f"Unknown artifact type: {types[unknown].iloc[0]}")
+
+    keys = types.copy()  # gs_state keys are the type name itself
+    if is_mh.any():
+        mh = art_df.loc[is_mh]
+        keys[is_mh] = (
+            "mh_" + mh["axis"].astype(str)
+            + "_" + mh["Hmax_T"].astype(int).astype(str) + "T"
+        )
+    if is_ins.any():
+        ins = art_df.loc[is_ins]
+        keys[is_ins] = "ins_" + ins["Ei_meV"].astype(int).astype(str) + "meV"
+
+    return (prefix + keys).tolist()
@@ -25,6 +25,41 @@ import pytest
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
 
 
+class TestLoadConfig:
+    """Tests for load_config()."""
+
+    def test_returns_plain_dict(self):
+        from config import load_config
+
+        cfg = load_config()
+        assert type(cfg) is dict
+        assert "schema_version" in cfg
+
+    def test_missing_vdp_section(self, tmp_path):
+        from config import load_config
+
+        path = tmp_path / "config.yml"
+        path.write_text("other:\n  key: 1\n")
+        assert load_config(path) == {}
+
+    def test_returns_independent_copies(self):
+        from config import load_config
+
+        first = load_config()
+        first["schema_version"] = "mutated"
+        assert load_config()["schema_version"] != "mutated"
+
+    def test_reloads_when_file_changes(self, tmp_path):
+        from config import load_config
+
+        path = tmp_path / "config.yml"
+        path.write_text("vdp:\n  max_hamiltonians: 1\n")
+        assert load_config(path)["max_hamiltonians"] == 1
+
+        path.write_text("vdp:\n  max_hamiltonians: 200\n")
+        assert load_config(path)["max_hamiltonians"] == 200
+
+
 class TestGetBaseDir:
     """Tests for get_base_dir()."""
 
@@ -15,6 +15,8 @@ Integration tests for data retrieval in both access modes.
 Mode A (Expert): query_manifest() -> direct HDF5 loading
 Mode B (Visualizer): Tiled adapter access via HTTP
 
+TestLoadFromManifest needs no server: it writes its own HDF5 files.
+
 Prerequisites:
     # Start server with registered data:
     uv run --with 'tiled[server]' tiled serve config config.yml --api-key secret
@@ -29,12 +31,126 @@ from pathlib import Path
 
 import pytest
 import numpy as np
+import pandas as pd
 import h5py
 
 # Add scripts directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
 
 
+MH_DATASET = "/curve/M_parallel"
+
+
+def write_curves(base_dir, n_files, n_points=50):
+    """Write n_files small M(H) HDF5 files; returns their relative paths."""
+    rng = np.random.default_rng(0)
+    paths = []
+    for i in range(n_files):
+        path_rel = f"mh/curve_{i}.h5"
+        os.makedirs(base_dir / "mh", exist_ok=True)
+        with h5py.File(base_dir / path_rel, "w") as f:
+            f[MH_DATASET] = rng.random(n_points) * 5.0
+        paths.append(path_rel)
+    return paths
+
+
+def load_per_row(manifest_df, base_dir, clamp_H0=True):
+    """Reference M(H) loader: one open, copy, and divide per manifest row."""
+    X_list, Theta_list = [], []
+    for _, row in manifest_df.iterrows():
+        path_rel = row.get("path_rel")
+        if not isinstance(path_rel, str):
+            continue
+        path = os.path.join(base_dir, path_rel)
+        if not os.path.exists(path):
+            continue
+        with h5py.File(path, "r") as f:
+            data = f[MH_DATASET][:]
+        spin_s = row.get("spin_s", 2.5)
+        g_factor = row.get("g_factor", 2.0)
+        if clamp_H0:
+            data = data.copy()
+            data[0] = 0.0
+        X_list.append(data / (g_factor * spin_s))
+        Theta_list.append([
+            row["Ja_meV"], row["Jb_meV"], row["Jc_meV"], row["Dc_meV"],
+            spin_s, g_factor,
+        ])
+    return np.stack(X_list, dtype=np.float32), np.array(Theta_list, dtype=np.float32)
+
+
+def make_manifest(paths):
+    """Manifest with duplicate paths, a missing file, and a null path."""
+    path_rel = [paths[0], paths[1], paths[0], "mh/missing.h5", paths[2], None, paths[1]]
+    n = len(path_rel)
+    return pd.DataFrame({
+        "huid": [f"h{i}" for i in range(n)],
+        "Ja_meV": np.linspace(-1.0, 1.0, n),
+        "Jb_meV": np.linspace(0.0, 0.6, n),
+        "Jc_meV": np.zeros(n),
+        "Dc_meV": np.full(n, -0.1),
+        "spin_s": [2.5, 1.0, 0.5, 2.5, 1.5, 2.5, 2.0],
+        "g_factor": [2.0, 2.1, 2.0, 2.0, 1.9, 2.0, 2.05],
+        "path_rel": path_rel,
+    })
+
+
+class TestLoadFromManifest:
+    """Tests for load_from_manifest() on local HDF5 files (no server)."""
+
+    def test_matches_per_row_loading(self, tmp_path):
+        """Test grouped reads match the per-row result, incl. duplicate paths."""
+        from query_manifest import load_from_manifest
+
+        manifest = make_manifest(write_curves(tmp_path, 3))
+
+        X, Theta = load_from_manifest(manifest, base_dir=str(tmp_path))
+        X_ref, Theta_ref = load_per_row(manifest, str(tmp_path))
+
+        # Missing file and null path are skipped: 7 rows -> 5 samples
+        assert X.shape == (5, 50)
+        assert X.dtype == np.float32
+        np.testing.assert_array_max_ulp(X, X_ref, maxulp=1)
+        np.testing.assert_array_equal(Theta, Theta_ref)
+
+    def test_unclamped_matches_per_row_loading(self, tmp_path):
+        """Test clamp_H0=False keeps the first point."""
+        from query_manifest import load_from_manifest
+
+        manifest = make_manifest(write_curves(tmp_path, 3))
+
+        X, _ = load_from_manifest(manifest, clamp_H0=False, base_dir=str(tmp_path))
+        X_ref, _ = load_per_row(manifest, str(tmp_path), clamp_H0=False)
+
+        assert np.all(X[:, 0] != 0.0)
+        np.testing.assert_array_max_ulp(X, X_ref, maxulp=1)
+
+    def test_missing_spin_columns_use_defaults(self, tmp_path):
+        """Test spin_s/g_factor default to 2.5/2.0 when the columns are absent."""
+        from query_manifest import load_from_manifest
+
+        manifest = make_manifest(write_curves(tmp_path, 3))
+        manifest = manifest.drop(columns=["spin_s", "g_factor"])
+
+        X, Theta = load_from_manifest(manifest, base_dir=str(tmp_path))
+        X_ref, Theta_ref = load_per_row(manifest, str(tmp_path))
+
+        np.testing.assert_array_equal(Theta[:, 4], 2.5)
+        np.testing.assert_array_equal(Theta[:, 5], 2.0)
+        np.testing.assert_array_max_ulp(X, X_ref, maxulp=1)
+        np.testing.assert_array_equal(Theta, Theta_ref)
+
+    def test_no_readable_files_raises(self, tmp_path):
+        """Test that a manifest with no existing files raises ValueError."""
+        from query_manifest import load_from_manifest
+
+        manifest = make_manifest(write_curves(tmp_path, 3))
+        manifest["path_rel"] = "mh/missing.h5"
+
+        with pytest.raises(ValueError, match="No data loaded"):
+            load_from_manifest(manifest, base_dir=str(tmp_path))
+
+
 @pytest.mark.integration
 class TestModeAQueryManifest:
     """Tests for Mode A: Expert path-based access via query_manifest."""
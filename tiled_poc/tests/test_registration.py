@@ -26,7 +26,10 @@ Run with:
 """
 
 import os
+import signal
 import sys
+import threading
+import time
 from pathlib import Path
 
 import pytest
@@ -74,6 +77,187 @@ class TestLoadManifests:
         assert art_huids.issubset(ham_huids)
 
 
+class TestArrayStructure:
+    """Tests for the memoized structure helper in bulk_register."""
+
+    def test_structure_id_matches_full_structure(self):
+        """Test that the cached id is the MD5 of the full structure."""
+        from bulk_register import compute_structure_id, get_array_structure
+
+        structure_id, structure = get_array_structure([600, 400])
+
+        assert structure["shape"] == [600, 400]
+        assert structure["chunks"] == [[600], [400]]
+        assert structure_id == compute_structure_id(structure)
+
+    def test_same_shape_is_reused(self):
+        """Test that repeated shapes return the cached structure."""
+        from bulk_register import get_array_structure
+
+        first = get_array_structure([200])
+        second = get_array_structure((200,))
+
+        assert first[0] == second[0]
+        assert first[1] is second[1]
+
+
+class RejectingClient:
+    """Stand-in catalog client whose container creation always fails.
+
+    Each call sleeps briefly, like a server round trip, so the pool cannot
+    drain the whole queue before the main thread sees the first failure.
+    """
+
+    latency = 0.01
+
+    def __init__(self):
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def keys(self):
+        return []
+
+    def create_container(self, key, metadata):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        raise RuntimeError("server rejected container")
+
+
+class RejectingContainer:
+    """Container whose child creation always fails."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def new(self, **kwargs):
+        with self.client.lock:
+            self.client.calls += 1
+        time.sleep(self.client.latency)
+        raise RuntimeError("server rejected array")
+
+
+class RejectingArraysClient(RejectingClient):
+    """Stand-in client that creates containers but rejects every array."""
+
+    def create_container(self, key, metadata):
+        return RejectingContainer(self)
+
+
+class SlowContainer:
+    """Container whose child creation succeeds."""
+
+    def new(self, **kwargs):
+        pass
+
+
+class SlowClient(RejectingClient):
+    """Stand-in client that accepts every container, one round trip each."""
+
+    def create_container(self, key, metadata):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        return SlowContainer()
+
+
+def make_frames(n):
+    """Minimal Hamiltonian/artifact manifests with one gs_state each."""
+    huids = [f"{i:08d}-0000" for i in range(n)]
+    ham_df = pd.DataFrame({
+        "huid": huids, "Ja_meV": 0.0, "Jb_meV": 0.0, "Jc_meV": 0.0,
+        "Dc_meV": 0.0, "spin_s": 2.5, "g_factor": 2.0,
+    })
+    art_df = pd.DataFrame({
+        "huid": huids, "type": "gs_state", "axis": None, "Hmax_T": None,
+        "Ei_meV": None, "path_rel": "gs.h5",
+    })
+    return ham_df, art_df
+
+
+def add_bad_artifact(art_df, huid):
+    """Append an mh_curve row whose Hmax_T is missing (no valid key)."""
+    bad = pd.DataFrame({
+        "huid": [huid], "type": ["mh_curve"], "axis": ["x"],
+        "Hmax_T": [float("nan")], "Ei_meV": [None], "path_rel": ["bad.h5"],
+    })
+    return pd.concat([art_df, bad], ignore_index=True)
+
+
+class TestPrepareNodeData:
+    """Tests for bulk_register.prepare_node_data() (no database)."""
+
+    def test_ignores_artifacts_outside_selection(self):
+        """Test that a bad row for an unselected Hamiltonian is not read."""
+        from bulk_register import prepare_node_data
+
+        ham_df, art_df = make_frames(20)
+        art_df = add_bad_artifact(art_df, ham_df["huid"][15])
+
+        ham_nodes, art_nodes, _ = prepare_node_data(ham_df, art_df, 5)
+
+        assert len(ham_nodes) == 5
+        assert len(art_nodes) == 5
+
+
+class TestRegisterUnifiedCatalog:
+    """Tests for register_unified_catalog() error handling (no server)."""
+
+    def test_ignores_artifacts_outside_selection(self, monkeypatch):
+        """Test that a bad row for an unselected Hamiltonian is not read."""
+        from register_catalog import register_unified_catalog
+
+        monkeypatch.setenv("VDP_MAX_HAMILTONIANS", "5")
+        ham_df, art_df = make_frames(20)
+        art_df = add_bad_artifact(art_df, ham_df["huid"][15])
+        client = SlowClient()
+
+        assert register_unified_catalog(client, ham_df, art_df, max_workers=4)
+        assert client.calls == 5
+
+    def test_container_failure_cancels_pending(self, monkeypatch):
+        """Test that a failing container stops queued Hamiltonians."""
+        from register_catalog import register_unified_catalog
+
+        monkeypatch.setenv("VDP_MAX_HAMILTONIANS", "200")
+        ham_df, art_df = make_frames(200)
+        client = RejectingClient()
+
+        with pytest.raises(RuntimeError, match="server rejected"):
+            register_unified_catalog(client, ham_df, art_df, max_workers=4)
+
+        assert client.calls < 200
+
+    def test_interrupt_cancels_pending(self, monkeypatch):
+        """Test that Ctrl-C while waiting on workers stops queued Hamiltonians."""
+        from register_catalog import register_unified_catalog
+
+        monkeypatch.setenv("VDP_MAX_HAMILTONIANS", "200")
+        ham_df, art_df = make_frames(200)
+        client = SlowClient()
+
+        timer = threading.Timer(0.2, signal.raise_signal, [signal.SIGINT])
+        timer.start()
+        with pytest.raises(KeyboardInterrupt):
+            register_unified_catalog(client, ham_df, art_df, max_workers=4)
+        timer.join()
+
+        assert client.calls < 200
+
+    def test_artifact_failures_trip_circuit_breaker(self, monkeypatch):
+        """Test that repeated artifact failures abort and cancel queued work."""
+        from register_catalog import MAX_ARTIFACT_ERRORS, register_unified_catalog
+
+        monkeypatch.setenv("VDP_MAX_HAMILTONIANS", "200")
+        ham_df, art_df = make_frames(200)
+        client = RejectingArraysClient()
+
+        with pytest.raises(RuntimeError, match="Aborting registration"):
+            register_unified_catalog(client, ham_df, art_df, max_workers=4)
+
+        assert MAX_ARTIFACT_ERRORS < client.calls < 200
+
+
 @pytest.mark.integration
 class TestHttpRegistration:
     """Integration tests for HTTP-based registration.
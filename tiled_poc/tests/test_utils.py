@@ -2,6 +2,8 @@
 # requires-python = ">=3.11"
 # dependencies = [
 #     "pytest",
+#     "pandas",
+#     "pyarrow",
 #     "ruamel.yaml",
 # ]
 # ///
@@ -23,7 +25,7 @@ import pytest
 # Add scripts directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
 
-from utils import make_artifact_key
+from utils import iter_records, make_artifact_key, make_artifact_keys, read_manifest
 
 
 class TestMakeArtifactKey:
@@ -79,3 +81,102 @@ class TestMakeArtifactKey:
         """Test that float Ei_meV values are converted to int."""
         row = {"type": "ins_powder", "Ei_meV": 12.0}
         assert make_artifact_key(row) == "ins_12meV"
+
+
+class TestMakeArtifactKeys:
+    """Tests for make_artifact_keys() (column-wise make_artifact_key)."""
+
+    ROWS = [
+        {"type": "mh_curve", "axis": "powder", "Hmax_T": 30.0, "Ei_meV": None},
+        {"type": "gs_state", "axis": None, "Hmax_T": None, "Ei_meV": None},
+        {"type": "ins_powder", "axis": None, "Hmax_T": None, "Ei_meV": 12.0},
+        {"type": "mh_curve", "axis": "x", "Hmax_T": 7.0, "Ei_meV": None},
+    ]
+
+    def test_matches_row_wise_keys(self):
+        import pandas as pd
+
+        df = pd.DataFrame(self.ROWS)
+        assert make_artifact_keys(df) == [make_artifact_key(r) for r in self.ROWS]
+
+    def test_with_prefix_path(self):
+        import pandas as pd
+
+        df = pd.DataFrame(self.ROWS)
+        assert make_artifact_keys(df, prefix="path_")[0] == "path_mh_powder_30T"
+
+    def test_unknown_type_raises(self):
+        import pandas as pd
+
+        df = pd.DataFrame(self.ROWS + [{"type": "unknown_artifact"}])
+        with pytest.raises(ValueError, match="Unknown artifact type"):
+            make_artifact_keys(df)
+
+
+class TestReadManifest:
+    """Tests for read_manifest() column projection."""
+
+    @pytest.fixture
+    def manifest_path(self, tmp_path):
+        import pandas as pd
+
+        path = tmp_path / "manifest.parquet"
+        pd.DataFrame({
+            "huid": ["a", "b"],
+            "Ja_meV": [0.5, -0.5],
+            "unused": [1, 2],
+        }).to_parquet(path)
+        return str(path)
+
+    def test_reads_only_requested_columns(self, manifest_path):
+        df = read_manifest(manifest_path, ["huid", "Ja_meV"])
+        assert list(df.columns) == ["huid", "Ja_meV"]
+        assert df["huid"].tolist() == ["a", "b"]
+
+    def test_skips_missing_optional_columns(self, manifest_path):
+        df = read_manifest(manifest_path, ["huid", "spin_s"])
+        assert list(df.columns) == ["huid"]
+
+    def test_reads_all_columns_by_default(self, manifest_path):
+        df = read_manifest(manifest_path)
+        assert list(df.columns) == ["huid", "Ja_meV", "unused"]
+
+    def test_max_rows_matches_head(self, tmp_path):
+        import pandas as pd
+
+        path = tmp_path / "multi_group.parquet"
+        df = pd.DataFrame({"huid": [f"h{i}" for i in range(10)], "x": range(10)})
+        df.to_parquet(path, row_group_size=3)
+
+        for n in (0, 2, 3, 7, 10, 50):
+            result = read_manifest(str(path), ["huid"], max_rows=n)
+            assert result["huid"].tolist() == df["huid"].head(n).tolist()
+
+
+class TestIterRecords:
+    """Tests for iter_records()."""
+
+    def test_yields_rows_in_order(self):
+        import pandas as pd
+
+        df = pd.DataFrame({"huid": ["a", "b", "c"], "Ja_meV": [0.5, -0.5, 1.0]})
+        records = list(iter_records(df, batch_size=2))
+        assert records == [
+            {"huid": "a", "Ja_meV": 0.5},
+            {"huid": "b", "Ja_meV": -0.5},
+            {"huid": "c", "Ja_meV": 1.0},
+        ]
+
+    def test_missing_values_become_none(self):
+        import numpy as np
+        import pandas as pd
+
+        df = pd.DataFrame({"axis": ["x", None], "Hmax_T": [7.0, np.nan]})
+        records = list(iter_records(df))
+        assert records[1] == {"axis": None, "Hmax_T": None}
+
+    def test_ignores_index(self):
+        import pandas as pd
+
+        df = pd.DataFrame({"huid": ["a", "b"]}, index=[10, 20])
+        assert list(iter_records(df)) == [{"huid": "a"}, {"huid": "b"}]